@@ -3,9 +3,20 @@ import uvicorn
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
+    # Tasks live in the in-process Database, so extra workers would each hold
+    # their own copy of the data; only opt in once state is moved out
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    # Per-worker cap on open connections; excess requests get a 503
+    limit_concurrency = int(os.environ.get("LIMIT_CONCURRENCY", 500))
     uvicorn.run(
         "src.main:app",
         host="0.0.0.0",
         port=port,
+        workers=workers,
+        limit_concurrency=limit_concurrency,
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard])
+        loop="auto",
+        http="auto",
+        access_log=False,
         log_level="info"
     )
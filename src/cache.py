@@ -0,0 +1,88 @@
+"""
+Cache module - Redis read-through cache for task list pages
+Disabled (every lookup misses) when REDIS_URL is unset or redis is not installed
+"""
+
+from itertools import count
+from typing import Optional
+import time
+from uuid import uuid4
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+
+class TaskCache:
+    """Cache-aside store for serialized task list pages
+
+    Page keys embed an in-process version number; bumping it on every write
+    invalidates all cached pages in O(1) without scanning for keys, and a
+    hit costs a single Redis call. Keys are namespaced by a random
+    per-process token because each worker owns its own in-memory database.
+
+    After a Redis error the cache stays off for ``cooldown`` seconds, so an
+    unreachable Redis costs one timeout per cooldown rather than two per
+    request.
+    """
+
+    def __init__(self, client=None, ttl: int = 5, cooldown: float = 5.0):
+        self._client = client
+        self._ttl = ttl
+        self._cooldown = cooldown
+        self._retry_at = 0.0
+        self._prefix = f"tasks:{uuid4().hex}"
+        self._versions = count()
+        self._version = next(self._versions)
+
+    @classmethod
+    def from_url(cls, url: Optional[str], ttl: int = 5, timeout: float = 0.1) -> "TaskCache":
+        """Create a cache for the given Redis URL, disabled if there is none
+
+        Short socket timeouts make a hung Redis fall back to the database
+        instead of blocking threadpool workers.
+        """
+        if not url or redis is None:
+            return cls(ttl=ttl)
+        client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        return cls(client, ttl=ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    def page_key(self, *params) -> Optional[str]:
+        """Build the key for a page, or None while the cache is off"""
+        if self._client is None or time.monotonic() < self._retry_at:
+            return None
+        # repr keeps None apart from the string "None"
+        return f"{self._prefix}:{self._version}:{params!r}"
+
+    def _trip(self):
+        """Stop using Redis until the cooldown has passed"""
+        self._retry_at = time.monotonic() + self._cooldown
+
+    def get(self, key: Optional[str]) -> Optional[bytes]:
+        """Get a cached page, or None on a miss"""
+        if key is None:
+            return None
+        try:
+            return self._client.get(key)
+        except redis.RedisError:
+            self._trip()
+            return None
+
+    def set(self, key: Optional[str], body: bytes):
+        """Store a page for a short time"""
+        if key is None or time.monotonic() < self._retry_at:
+            return
+        try:
+            self._client.set(key, body, ex=self._ttl)
+        except redis.RedisError:
+            self._trip()
+
+    def invalidate(self):
+        """Invalidate all cached pages after a write"""
+        # next() on itertools.count is atomic under the GIL
+        self._version = next(self._versions)
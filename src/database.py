@@ -3,18 +3,103 @@ Database module - In-memory database for demo purposes
 In production, replace with PostgreSQL/MySQL
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from threading import Lock
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from heapq import nsmallest
+from itertools import count
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Set, Any
+from threading import Condition
+import time
+
+
+PRIORITIES = ("low", "medium", "high", "critical")
+_PRIORITY_INDEX = {name: idx for idx, name in enumerate(PRIORITIES)}
+
+# Update fields that map straight onto a column
+_COLUMNS = {"title": "_titles", "description": "_descriptions", "completed": "_completed"}
+
+
+class _RWLock:
+    """Readers-writer lock: any number of readers or a single writer
+
+    Waiting writers block new readers so a steady read load cannot starve
+    writes.
+    """
+    
+    def __init__(self):
+        self._cond = Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+@dataclass(slots=True)
+class TaskRow:
+    """A single task as returned to callers"""
+    id: int
+    title: str
+    description: Optional[str]
+    priority: str
+    completed: bool
+    created_at: datetime
+    updated_at: datetime
 
 
 class Database:
-    """Thread-safe in-memory database"""
+    """Thread-safe in-memory database
+
+    Tasks are stored column-wise (one list/array per field) so rows are
+    built only for the tasks actually returned. Rows are kept in id order,
+    so a task is located by bisecting the id column. Ids are also indexed
+    by priority and completion, which serves filtered reads and stats
+    without scanning every task.
+    """
     
     def __init__(self):
-        self._tasks: Dict[int, dict] = {}
-        self._counter = 0
-        self._lock = Lock()
+        self._ids = array("q")
+        self._titles: List[str] = []
+        self._descriptions: List[Optional[str]] = []
+        self._priority_idx = array("b")
+        self._completed: List[bool] = []
+        # Epoch nanoseconds; datetimes are only built for returned rows
+        self._created_at = array("q")
+        self._updated_at = array("q")
+        self._id_gen = count(1)
+        self._by_priority: List[Set[int]] = [set() for _ in PRIORITIES]
+        self._by_completed: Dict[bool, Set[int]] = {False: set(), True: set()}
+        self._lock = _RWLock()
         self._connected = True
         
         # Add some demo data
@@ -23,104 +108,165 @@ class Database:
     def _init_demo_data(self):
         """Initialize with demo tasks"""
         demo_tasks = [
-            {"title": "Setup CI Pipeline", "description": "Configure GitHub Actions", "priority": "high"},
-            {"title": "Write Unit Tests", "description": "Add pytest tests", "priority": "high"},
-            {"title": "Docker Configuration", "description": "Create Dockerfile", "priority": "medium"},
-            {"title": "Documentation", "description": "Write API docs", "priority": "low"},
+            ("Setup CI Pipeline", "Configure GitHub Actions", "high"),
+            ("Write Unit Tests", "Add pytest tests", "high"),
+            ("Docker Configuration", "Create Dockerfile", "medium"),
+            ("Documentation", "Write API docs", "low"),
         ]
         
-        for task_data in demo_tasks:
-            from pydantic import BaseModel
-            
-            class TempTask(BaseModel):
-                title: str
-                description: Optional[str] = None
-                priority: str = "medium"
-            
-            self.create_task(TempTask(**task_data))
+        for title, description, priority in demo_tasks:
+            self._create_task_raw(title, description, priority)
     
     def is_connected(self) -> bool:
         """Check database connection status"""
         return self._connected
     
+    def clear(self):
+        """Remove all tasks and restart ids from 1"""
+        with self._lock.write():
+            for column in (self._ids, self._priority_idx, self._created_at, self._updated_at):
+                del column[:]
+            for column in (self._titles, self._descriptions, self._completed):
+                column.clear()
+            self._id_gen = count(1)
+            for ids in (*self._by_priority, *self._by_completed.values()):
+                ids.clear()
+    
+    def _index_of(self, task_id: int) -> Optional[int]:
+        """Find the row index of a task, or None"""
+        idx = bisect_left(self._ids, task_id)
+        if idx < len(self._ids) and self._ids[idx] == task_id:
+            return idx
+        return None
+    
+    def _row(self, idx: int) -> TaskRow:
+        """Assemble a task from its columns"""
+        return TaskRow(
+            self._ids[idx],
+            self._titles[idx],
+            self._descriptions[idx],
+            PRIORITIES[self._priority_idx[idx]],
+            self._completed[idx],
+            datetime.fromtimestamp(self._created_at[idx] / 1e9, timezone.utc),
+            datetime.fromtimestamp(self._updated_at[idx] / 1e9, timezone.utc)
+        )
+    
     def get_tasks(
         self,
         skip: int = 0,
         limit: int = 100,
         completed: Optional[bool] = None,
         priority: Optional[str] = None
-    ) -> List[dict]:
+    ) -> List[TaskRow]:
         """Get all tasks with filtering"""
-        with self._lock:
-            tasks = list(self._tasks.values())
+        with self._lock.read():
+            if completed is None and not priority:
+                return [self._row(i) for i in range(len(self._ids))[skip:skip + limit]]
             
-            # Apply filters
+            # Apply filters via the indices
+            matches: Optional[Set[int]] = None
             if completed is not None:
-                tasks = [t for t in tasks if t["completed"] == completed]
+                matches = self._by_completed[completed]
             if priority:
-                tasks = [t for t in tasks if t["priority"] == priority]
+                wanted = _PRIORITY_INDEX.get(priority)
+                if wanted is None:
+                    return []
+                by_priority = self._by_priority[wanted]
+                matches = by_priority if matches is None else matches & by_priority
             
-            # Apply pagination
-            return tasks[skip:skip + limit]
+            # Apply pagination in id (creation) order, keeping only the
+            # skip + limit smallest ids rather than sorting every match;
+            # negative bounds count from the end, so they need the full sort
+            if skip < 0 or limit < 0:
+                page = sorted(matches)[skip:skip + limit]
+            else:
+                page = nsmallest(skip + limit, matches)[skip:]
+            return [self._row(self._index_of(task_id)) for task_id in page]
     
-    def get_task(self, task_id: int) -> Optional[dict]:
+    def get_task(self, task_id: int) -> Optional[TaskRow]:
         """Get a specific task"""
-        with self._lock:
-            return self._tasks.get(task_id)
+        with self._lock.read():
+            idx = self._index_of(task_id)
+            return None if idx is None else self._row(idx)
     
-    def create_task(self, task_data) -> dict:
+    def _create_task_raw(self, title: str, description: Optional[str], priority: str) -> int:
+        """Append a task without validation and return its row index
+
+        Must be called under the write lock; only __init__ (via
+        _init_demo_data) may skip it, as no other thread can see the
+        database yet.
+        """
+        # Ids are drawn under the write lock so they are appended in order,
+        # which _index_of's bisect relies on
+        task_id = next(self._id_gen)
+        now = time.time_ns()
+        
+        self._ids.append(task_id)
+        self._titles.append(title)
+        self._descriptions.append(description)
+        priority_idx = _PRIORITY_INDEX[priority]
+        self._priority_idx.append(priority_idx)
+        self._by_priority[priority_idx].add(task_id)
+        self._completed.append(False)
+        self._by_completed[False].add(task_id)
+        self._created_at.append(now)
+        self._updated_at.append(now)
+        
+        return len(self._ids) - 1
+    
+    def create_task(self, task_data) -> TaskRow:
         """Create a new task"""
-        with self._lock:
-            self._counter += 1
-            now = datetime.utcnow()
-            
-            task = {
-                "id": self._counter,
-                "title": task_data.title,
-                "description": task_data.description,
-                "priority": task_data.priority,
-                "completed": False,
-                "created_at": now,
-                "updated_at": now
-            }
-            
-            self._tasks[self._counter] = task
-            return task
+        with self._lock.write():
+            idx = self._create_task_raw(task_data.title, task_data.description, task_data.priority)
+            return self._row(idx)
     
-    def update_task(self, task_id: int, task_update) -> Optional[dict]:
+    def update_task(self, task_id: int, task_update) -> Optional[TaskRow]:
         """Update an existing task"""
-        with self._lock:
-            if task_id not in self._tasks:
+        with self._lock.write():
+            idx = self._index_of(task_id)
+            if idx is None:
                 return None
             
-            task = self._tasks[task_id]
-            update_data = task_update.model_dump(exclude_unset=True)
-            
-            for field, value in update_data.items():
-                if value is not None:
-                    task[field] = value
+            # Only the fields the client sent; avoids building a model_dump dict
+            for field in task_update.model_fields_set:
+                value = getattr(task_update, field)
+                if value is None:
+                    continue
+                if field == "priority":
+                    priority = _PRIORITY_INDEX[value]
+                    self._by_priority[self._priority_idx[idx]].discard(task_id)
+                    self._by_priority[priority].add(task_id)
+                    self._priority_idx[idx] = priority
+                    continue
+                if field == "completed":
+                    self._by_completed[self._completed[idx]].discard(task_id)
+                    self._by_completed[value].add(task_id)
+                getattr(self, _COLUMNS[field])[idx] = value
             
-            task["updated_at"] = datetime.utcnow()
-            return task
+            self._updated_at[idx] = time.time_ns()
+            return self._row(idx)
     
     def delete_task(self, task_id: int) -> bool:
         """Delete a task"""
-        with self._lock:
-            if task_id not in self._tasks:
+        with self._lock.write():
+            idx = self._index_of(task_id)
+            if idx is None:
                 return False
-            del self._tasks[task_id]
+            self._by_priority[self._priority_idx[idx]].discard(task_id)
+            self._by_completed[self._completed[idx]].discard(task_id)
+            # Deleting in place (rather than swapping in the last row) keeps
+            # the columns in id order, which pagination relies on
+            for column in (self._ids, self._titles, self._descriptions, self._priority_idx,
+                           self._completed, self._created_at, self._updated_at):
+                del column[idx]
             return True
     
     def get_stats(self) -> dict:
         """Get task statistics"""
-        with self._lock:
-            tasks = list(self._tasks.values())
-            total = len(tasks)
-            completed = sum(1 for t in tasks if t["completed"])
-            
-            priority_counts = {"low": 0, "medium": 0, "high": 0, "critical": 0}
-            for task in tasks:
-                priority_counts[task["priority"]] += 1
+        with self._lock.read():
+            total = len(self._ids)
+            completed = len(self._by_completed[True])
+            priority_counts = {name: len(ids) for name, ids in zip(PRIORITIES, self._by_priority)}
             
             return {
                 "total_tasks": total,
@@ -2,27 +2,53 @@
 FastAPI Application - Task Management API
 """
 
-from fastapi import FastAPI, HTTPException, status
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Literal, Optional, List
+from datetime import datetime, timezone
+import orjson
 import uvicorn
 import os
 
 try:
+    from .cache import TaskCache
     from .database import Database
-    from .metrics import setup_metrics, track_request
+    from .metrics import setup_metrics
 except ImportError:
+    from cache import TaskCache
     from database import Database
-    from metrics import setup_metrics, track_request
+    from metrics import setup_metrics
+
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 200))
+
+# Write UTC datetimes with a "Z" suffix, matching Pydantic-serialized models
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+class UTCJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Task routes are sync and run in anyio's threadpool (40 threads by default)
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+
 
 app = FastAPI(
     title="Task Management API",
     description="A demo API for CI/CD pipeline demonstration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=UTCJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -36,12 +62,20 @@ app.add_middleware(
 setup_metrics(app)
 
 db = Database()
+cache = TaskCache.from_url(
+    os.getenv("REDIS_URL"),
+    ttl=int(os.getenv("CACHE_TTL", 5)),
+    timeout=float(os.getenv("REDIS_TIMEOUT", 0.1))
+)
+
+
+Priority = Literal["low", "medium", "high", "critical"]
 
 
 class TaskCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=1000)
-    priority: str = Field(default="medium", pattern="^(low|medium|high|critical)$")
+    priority: Priority = "medium"
     
     class Config:
         json_schema_extra = {
@@ -56,7 +90,7 @@ class TaskCreate(BaseModel):
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=1000)
-    priority: Optional[str] = Field(None, pattern="^(low|medium|high|critical)$")
+    priority: Optional[Priority] = None
     completed: Optional[bool] = None
 
 
@@ -78,7 +112,6 @@ class HealthCheck(BaseModel):
 
 
 @app.get("/", tags=["Root"])
-@track_request
 async def root():
     return {
         "message": "Welcome to Task Management API",
@@ -89,81 +122,96 @@ async def root():
 
 
 @app.get("/health", response_model=HealthCheck, tags=["Health"])
-@track_request
 async def health_check():
     db_status = "connected" if db.is_connected() else "disconnected"
     return HealthCheck(
         status="healthy",
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
         version="1.0.0",
         database=db_status
     )
 
 
 @app.get("/tasks", response_model=List[Task], tags=["Tasks"])
-@track_request
-async def get_tasks(
+def get_tasks(
     skip: int = 0,
     limit: int = 100,
     completed: Optional[bool] = None,
     priority: Optional[str] = None
 ):
-    return db.get_tasks(skip=skip, limit=limit, completed=completed, priority=priority)
+    # Task routes return responses directly: orjson encodes the TaskRow
+    # dataclasses natively, skipping re-validation through the Task model,
+    # which is still used for the OpenAPI schema
+    key = cache.page_key(skip, limit, completed, priority)
+    body = cache.get(key)
+    if body is None:
+        body = orjson.dumps(
+            db.get_tasks(skip=skip, limit=limit, completed=completed, priority=priority),
+            option=ORJSON_OPTIONS
+        )
+        cache.set(key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
-@track_request
-async def get_task(task_id: int):
+def get_task(task_id: int):
     task = db.get_task(task_id)
-    if not task:
+    if task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found"
         )
-    return task
+    return UTCJSONResponse(task)
 
 
 @app.post("/tasks", response_model=Task, status_code=status.HTTP_201_CREATED, tags=["Tasks"])
-@track_request
-async def create_task(task: TaskCreate):
-    return db.create_task(task)
+def create_task(task: TaskCreate):
+    created = db.create_task(task)
+    cache.invalidate()
+    return UTCJSONResponse(created, status_code=status.HTTP_201_CREATED)
 
 
 @app.put("/tasks/{task_id}", response_model=Task, tags=["Tasks"])
-@track_request
-async def update_task(task_id: int, task_update: TaskUpdate):
+def update_task(task_id: int, task_update: TaskUpdate):
     task = db.update_task(task_id, task_update)
-    if not task:
+    if task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found"
         )
-    return task
+    cache.invalidate()
+    return UTCJSONResponse(task)
 
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Tasks"])
-@track_request
-async def delete_task(task_id: int):
+def delete_task(task_id: int):
     success = db.delete_task(task_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found"
         )
+    cache.invalidate()
     return None
 
 
 @app.get("/tasks/stats/summary", tags=["Statistics"])
-@track_request
-async def get_stats():
+def get_stats():
     return db.get_stats()
 
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
+    reload = os.getenv("ENV", "development") == "development"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=os.getenv("ENV", "development") == "development"
+        # uvicorn ignores workers when reloading; see run.py for the default of 1
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", 1)),
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", 500)),
+        loop="auto",
+        http="auto",
+        access_log=False,
+        reload=reload
     )
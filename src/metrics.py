@@ -3,11 +3,11 @@ Prometheus Metrics Module
 Exposes /metrics endpoint for monitoring
 """
 
+import os
 import time
-from functools import wraps
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 # Define metrics
@@ -39,36 +39,73 @@ TASKS_COMPLETED = Gauge(
     'Number of completed tasks'
 )
 
+# Scrapes within this many seconds reuse the last rendered exposition
+METRICS_CACHE_TTL = float(os.getenv("METRICS_CACHE_TTL", 0.25))
+_exposition = {"at": float("-inf"), "body": b""}
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware to collect request metrics"""
+# Labelled children, cached so each request skips .labels() lookups
+_count_children = {}
+_latency_children = {}
+
+
+def _endpoint_label(scope: Scope) -> str:
+    """Label requests by route template so /tasks/1 and /tasks/2 share a series"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Plain Starlette routes (e.g. /docs) have fixed paths; anything that
+    # matched no route at all is grouped to keep label cardinality bounded
+    if "endpoint" in scope:
+        return scope["path"]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware to collect request metrics
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip metrics endpoint
-        if request.url.path == "/metrics":
-            return await call_next(request)
+    Plain ASGI rather than BaseHTTPMiddleware, which runs every request in
+    an extra task and pipes the response through a memory stream.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Skip metrics endpoint and non-HTTP traffic
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
         ACTIVE_REQUESTS.inc()
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start_time
+            ACTIVE_REQUESTS.dec()
             
-            # Record metrics
-            REQUEST_COUNT.labels(
-                method=request.method,
-                endpoint=request.url.path,
-                status_code=response.status_code
-            ).inc()
+            # Record metrics; an unhandled exception counts as a 500
+            series = (scope["method"], _endpoint_label(scope))
+            count_key = (*series, str(status_code))
             
-            REQUEST_LATENCY.labels(
-                method=request.method,
-                endpoint=request.url.path
-            ).observe(time.time() - start_time)
+            counter = _count_children.get(count_key)
+            if counter is None:
+                counter = _count_children[count_key] = REQUEST_COUNT.labels(*count_key)
+            counter.inc()
             
-            return response
-        finally:
-            ACTIVE_REQUESTS.dec()
+            latency = _latency_children.get(series)
+            if latency is None:
+                latency = _latency_children[series] = REQUEST_LATENCY.labels(*series)
+            latency.observe(duration)
 
 
 def setup_metrics(app: FastAPI):
@@ -80,15 +117,12 @@ def setup_metrics(app: FastAPI):
     # Add metrics endpoint
     @app.get("/metrics", include_in_schema=False)
     async def metrics():
+        now = time.monotonic()
+        if now - _exposition["at"] > METRICS_CACHE_TTL:
+            _exposition["body"] = generate_latest()
+            _exposition["at"] = now
         return Response(
-            content=generate_latest(),
+            content=_exposition["body"],
             media_type=CONTENT_TYPE_LATEST
         )
 
-
-def track_request(func):
-    """Decorator to track individual endpoint calls"""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        return await func(*args, **kwargs)
-    return wrapper
@@ -0,0 +1,45 @@
+"""
+Shared pytest configuration
+Puts src on the import path once for every test module
+"""
+
+import asyncio
+import os
+import sys
+from typing import Iterator, Optional
+
+import pytest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from cache import TaskCache  # noqa: E402
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client"""
+
+    def __init__(self) -> None:
+        self.data: dict = {}
+
+    def get(self, key: str):
+        return self.data.get(key)
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.data[key] = value
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """One event loop for the session so async clients can be session-scoped"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def task_cache() -> TaskCache:
+    """A task cache backed by an in-memory fake Redis"""
+    return TaskCache(FakeRedis())
@@ -3,15 +3,9 @@ End-to-End (E2E) / Acceptance Tests
 Tests complete user workflows and scenarios
 """
 
-import sys
-import os
-
 import pytest
 from fastapi.testclient import TestClient
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from main import app
 
 
@@ -129,11 +123,11 @@ class TestUserWorkflows:
         # Check metrics endpoint
         metrics_response = client.get("/metrics")
         assert metrics_response.status_code == 200
-        metrics = metrics_response.text
+        metrics = metrics_response.content
 
         # Verify expected metrics are present
-        assert "http_requests_total" in metrics
-        assert "http_request_duration_seconds" in metrics
+        assert b"http_requests_total" in metrics
+        assert b"http_request_duration_seconds" in metrics
 
     def test_api_error_handling(self, client: TestClient) -> None:
         """
@@ -3,30 +3,55 @@ Integration Tests for Task Management API
 Tests API endpoints with actual HTTP requests
 """
 
-import sys
-import os
+import asyncio
+from typing import AsyncIterator, Dict
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import main
+import metrics
+from cache import TaskCache
+from main import TaskCreate, app, db
 
-from main import app
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    """Create one in-process ASGI client for the session"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def static_responses(client: httpx.AsyncClient) -> Dict[str, httpx.Response]:
+    """Fetch endpoints whose shape doesn't depend on test state once per session"""
+    paths = ("/", "/health", "/docs", "/metrics")
+    responses = await asyncio.gather(*(client.get(path) for path in paths))
+    return dict(zip(paths, responses))
+
+
+@pytest.fixture(autouse=True)
+def reset_db() -> None:
+    """Start each test from an empty database"""
+    db.clear()
 
 
 @pytest.fixture
-def client() -> TestClient:
-    """Create test client"""
-    return TestClient(app)
+def task_id() -> int:
+    """Seed a task straight into the database and return its id"""
+    return db.create_task(TaskCreate(title="Seed Task")).id
 
 
 class TestRootEndpoints:
     """Test root and health endpoints"""
 
-    def test_root_endpoint(self, client: TestClient) -> None:
+    async def test_root_endpoint(self, static_responses: Dict[str, httpx.Response]) -> None:
         """Test root endpoint returns API info"""
-        response = client.get("/")
+        response = static_responses["/"]
 
         assert response.status_code == 200
         data = response.json()
@@ -34,9 +59,9 @@ class TestRootEndpoints:
         assert "version" in data
         assert data["version"] == "1.0.0"
 
-    def test_health_endpoint(self, client: TestClient) -> None:
+    async def test_health_endpoint(self, static_responses: Dict[str, httpx.Response]) -> None:
         """Test health check endpoint"""
-        response = client.get("/health")
+        response = static_responses["/health"]
 
         assert response.status_code == 200
         data = response.json()
@@ -44,30 +69,54 @@ class TestRootEndpoints:
         assert "timestamp" in data
         assert "database" in data
 
-    def test_docs_available(self, client: TestClient) -> None:
+    async def test_docs_available(self, static_responses: Dict[str, httpx.Response]) -> None:
         """Test API documentation is available"""
-        response = client.get("/docs")
+        response = static_responses["/docs"]
         assert response.status_code == 200
 
-    def test_metrics_endpoint(self, client: TestClient) -> None:
+    async def test_metrics_endpoint(self, static_responses: Dict[str, httpx.Response]) -> None:
         """Test Prometheus metrics endpoint"""
-        response = client.get("/metrics")
+        response = static_responses["/metrics"]
 
         assert response.status_code == 200
-        assert "http_requests_total" in response.text
+        assert b"http_requests_total" in response.content
+
+    async def test_metrics_scrapes_are_coalesced(self, client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test scrapes within the cache window reuse the same exposition"""
+        monkeypatch.setattr(metrics, "METRICS_CACHE_TTL", 60)
+        first = await client.get("/metrics")
+
+        await client.get("/tasks")
+        second = await client.get("/metrics")
+
+        assert second.content == first.content
+
+    async def test_metrics_use_route_templates(self, client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test metrics group task ids under the route template"""
+        monkeypatch.setattr(metrics, "METRICS_CACHE_TTL", 0)
+        await client.get("/tasks/1")
+        await client.get("/tasks/2")
+        await client.get("/no/such/path")
+
+        response = await client.get("/metrics")
+
+        assert b'endpoint="/tasks/{task_id}"' in response.content
+        assert b'endpoint="/tasks/1"' not in response.content
+        assert b'endpoint="unmatched"' in response.content
 
 
 class TestTaskEndpoints:
     """Test task CRUD endpoints"""
 
-    def test_get_all_tasks(self, client: TestClient) -> None:
+    async def test_get_all_tasks(self, client: httpx.AsyncClient) -> None:
         """Test getting all tasks"""
-        response = client.get("/tasks")
+        response = await client.get("/tasks")
 
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert response.headers["content-type"].startswith("application/json")
+        assert response.content.lstrip().startswith(b"[")
 
-    def test_create_task(self, client: TestClient) -> None:
+    async def test_create_task(self, client: httpx.AsyncClient) -> None:
         """Test creating a new task"""
         task_data = {
             "title": "Integration Test Task",
@@ -75,7 +124,7 @@ class TestTaskEndpoints:
             "priority": "high"
         }
 
-        response = client.post("/tasks", json=task_data)
+        response = await client.post("/tasks", json=task_data)
 
         assert response.status_code == 201
         data = response.json()
@@ -85,107 +134,94 @@ class TestTaskEndpoints:
         assert data["completed"] is False
         assert "id" in data
 
-    def test_create_task_minimal(self, client: TestClient) -> None:
+    async def test_timestamps_share_one_format(self, client: httpx.AsyncClient, task_id: int) -> None:
+        """Test task and health timestamps are both UTC with a Z suffix"""
+        listed = (await client.get("/tasks")).json()[0]
+        single = (await client.get(f"/tasks/{task_id}")).json()
+        health = (await client.get("/health")).json()
+
+        timestamps = [listed["created_at"], single["updated_at"], health["timestamp"]]
+        assert all(ts.endswith("Z") for ts in timestamps)
+
+    async def test_create_task_minimal(self, client: httpx.AsyncClient) -> None:
         """Test creating task with minimal data"""
         task_data = {"title": "Minimal Task"}
 
-        response = client.post("/tasks", json=task_data)
+        response = await client.post("/tasks", json=task_data)
 
         assert response.status_code == 201
         data = response.json()
         assert data["title"] == "Minimal Task"
         assert data["priority"] == "medium"  # Default
 
-    def test_create_task_invalid_priority(self, client: TestClient) -> None:
+    async def test_create_task_invalid_priority(self, client: httpx.AsyncClient) -> None:
         """Test creating task with invalid priority"""
         task_data = {
             "title": "Invalid Priority",
             "priority": "super-urgent"  # Invalid
         }
 
-        response = client.post("/tasks", json=task_data)
+        response = await client.post("/tasks", json=task_data)
 
         assert response.status_code == 422  # Validation error
 
-    def test_create_task_empty_title(self, client: TestClient) -> None:
+    async def test_create_task_empty_title(self, client: httpx.AsyncClient) -> None:
         """Test creating task with empty title"""
         task_data = {"title": ""}
 
-        response = client.post("/tasks", json=task_data)
+        response = await client.post("/tasks", json=task_data)
 
         assert response.status_code == 422  # Validation error
 
-    def test_get_specific_task(self, client: TestClient) -> None:
+    async def test_get_specific_task(self, client: httpx.AsyncClient, task_id: int) -> None:
         """Test getting a specific task"""
-        # First create a task
-        create_response = client.post("/tasks", json={"title": "Specific Task"})
-        task_id = create_response.json()["id"]
-
-        # Then get it
-        response = client.get(f"/tasks/{task_id}")
+        response = await client.get(f"/tasks/{task_id}")
 
         assert response.status_code == 200
-        assert response.json()["title"] == "Specific Task"
+        assert response.json()["title"] == "Seed Task"
 
-    def test_get_nonexistent_task(self, client: TestClient) -> None:
-        """Test getting a task that doesn't exist"""
-        response = client.get("/tasks/99999")
+    @pytest.mark.parametrize("method,extra", [
+        ("get", {}),
+        ("put", {"json": {"title": "Updated"}}),
+        ("delete", {}),
+    ])
+    async def test_nonexistent_task(self, client: httpx.AsyncClient, method: str, extra: dict) -> None:
+        """Test reading, updating and deleting a task that doesn't exist"""
+        response = await getattr(client, method)("/tasks/99999", **extra)
 
         assert response.status_code == 404
 
-    def test_update_task(self, client: TestClient) -> None:
+    async def test_update_task(self, client: httpx.AsyncClient, task_id: int) -> None:
         """Test updating a task"""
-        # Create task
-        create_response = client.post("/tasks", json={"title": "To Update"})
-        task_id = create_response.json()["id"]
-
-        # Update it
         update_data = {
             "title": "Updated Title",
             "completed": True
         }
-        response = client.put(f"/tasks/{task_id}", json=update_data)
+        response = await client.put(f"/tasks/{task_id}", json=update_data)
 
         assert response.status_code == 200
         data = response.json()
         assert data["title"] == "Updated Title"
         assert data["completed"] is True
 
-    def test_update_nonexistent_task(self, client: TestClient) -> None:
-        """Test updating a task that doesn't exist"""
-        response = client.put("/tasks/99999", json={"title": "Updated"})
-
-        assert response.status_code == 404
-
-    def test_delete_task(self, client: TestClient) -> None:
+    async def test_delete_task(self, client: httpx.AsyncClient, task_id: int) -> None:
         """Test deleting a task"""
-        # Create task
-        create_response = client.post("/tasks", json={"title": "To Delete"})
-        task_id = create_response.json()["id"]
-
-        # Delete it
-        response = client.delete(f"/tasks/{task_id}")
+        response = await client.delete(f"/tasks/{task_id}")
 
         assert response.status_code == 204
 
         # Verify it's gone
-        get_response = client.get(f"/tasks/{task_id}")
+        get_response = await client.get(f"/tasks/{task_id}")
         assert get_response.status_code == 404
 
-    def test_delete_nonexistent_task(self, client: TestClient) -> None:
-        """Test deleting a task that doesn't exist"""
-        response = client.delete("/tasks/99999")
-
-        assert response.status_code == 404
-
-    def test_get_tasks_with_filters(self, client: TestClient) -> None:
+    async def test_get_tasks_with_filters(self, client: httpx.AsyncClient) -> None:
         """Test filtering tasks"""
-        # Create tasks with different priorities
-        client.post("/tasks", json={"title": "High Priority", "priority": "high"})
-        client.post("/tasks", json={"title": "Low Priority", "priority": "low"})
+        # Seed tasks with different priorities straight into the database
+        db.create_task(TaskCreate(title="High Priority", priority="high"))
+        db.create_task(TaskCreate(title="Low Priority", priority="low"))
 
         # Filter by priority
-        response = client.get("/tasks?priority=high")
+        response = await client.get("/tasks?priority=high")
 
         assert response.status_code == 200
         tasks = response.json()
@@ -193,19 +229,61 @@ class TestTaskEndpoints:
         high_priority = [t for t in tasks if t["priority"] == "high"]
         assert len(high_priority) > 0
 
-    def test_get_tasks_with_pagination(self, client: TestClient) -> None:
+    async def test_get_tasks_with_pagination(self, client: httpx.AsyncClient) -> None:
         """Test paginating tasks"""
-        response = client.get("/tasks?skip=0&limit=2")
+        response = await client.get("/tasks?skip=0&limit=2")
 
         assert response.status_code == 200
 
 
+class TestTaskListCache:
+    """Test the task list is served from and invalidated in the cache"""
+
+    @pytest.fixture(autouse=True)
+    def use_cache(self, task_cache: TaskCache, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Route the app through an enabled cache"""
+        monkeypatch.setattr(main, "cache", task_cache)
+
+    async def test_pages_are_served_from_cache(self, client: httpx.AsyncClient, task_id: int) -> None:
+        """Test a repeated read skips the database until the page is invalidated"""
+        first = await client.get("/tasks")
+        # Bypass the API so nothing invalidates the cached page
+        db.create_task(TaskCreate(title="Not Yet Visible"))
+
+        second = await client.get("/tasks")
+
+        assert [t["id"] for t in first.json()] == [task_id]
+        assert second.content == first.content
+
+    async def test_string_none_filter_does_not_share_the_unfiltered_page(self, client: httpx.AsyncClient, task_id: int) -> None:
+        """Test ?priority=None neither poisons nor reads the unfiltered page"""
+        poisoned = await client.get("/tasks?priority=None")
+        unfiltered = await client.get("/tasks")
+        filtered = await client.get("/tasks?priority=None")
+
+        assert poisoned.json() == filtered.json() == []
+        assert [t["id"] for t in unfiltered.json()] == [task_id]
+
+    async def test_writes_refresh_the_list(self, client: httpx.AsyncClient, task_id: int) -> None:
+        """Test the list reflects each POST, PUT and DELETE"""
+        await client.get("/tasks")
+
+        created = (await client.post("/tasks", json={"title": "Posted"})).json()
+        assert [t["title"] for t in (await client.get("/tasks")).json()] == ["Seed Task", "Posted"]
+
+        await client.put(f"/tasks/{created['id']}", json={"title": "Put"})
+        assert [t["title"] for t in (await client.get("/tasks")).json()] == ["Seed Task", "Put"]
+
+        await client.delete(f"/tasks/{task_id}")
+        assert [t["title"] for t in (await client.get("/tasks")).json()] == ["Put"]
+
+
 class TestStatistics:
     """Test statistics endpoint"""
 
-    def test_get_stats(self, client: TestClient) -> None:
+    async def test_get_stats(self, client: httpx.AsyncClient) -> None:
         """Test getting task statistics"""
-        response = client.get("/tasks/stats/summary")
+        response = await client.get("/tasks/stats/summary")
 
         assert response.status_code == 200
         data = response.json()
@@ -3,17 +3,15 @@ Unit Tests for Task Management API
 Tests individual components in isolation
 """
 
-import sys
-import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 import pytest
 from pydantic import BaseModel
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
+import cache as cache_module
+from cache import TaskCache
 from database import Database
 
 
@@ -32,21 +30,29 @@ class MockTaskUpdate(BaseModel):
     completed: Optional[bool] = None
 
 
+# Shared, already-validated update reused by tests that only mark tasks done
+_MARK_COMPLETED = MockTaskUpdate(completed=True)
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    """Create one database for the module"""
+    return Database()
+
+
 class TestDatabase:
     """Unit tests for Database class"""
 
-    def setup_method(self) -> None:
-        """Setup fresh database for each test"""
-        self.db = Database()
-        # Clear demo data
-        self.db._tasks.clear()
-        self.db._counter = 0
+    @pytest.fixture(autouse=True)
+    def reset(self, db: Database) -> None:
+        """Clear the shared database (including demo data) before each test"""
+        db.clear()
 
-    def test_database_connection(self) -> None:
+    def test_database_connection(self, db: Database) -> None:
         """Test database connection status"""
-        assert self.db.is_connected() is True
+        assert db.is_connected() is True
 
-    def test_create_task(self) -> None:
+    def test_create_task(self, db: Database) -> None:
         """Test task creation"""
         task_data = MockTaskCreate(
             title="Test Task",
@@ -54,104 +60,156 @@ class TestDatabase:
             priority="high"
         )
 
-        task = self.db.create_task(task_data)
+        task = db.create_task(task_data)
 
-        assert task["id"] == 1
-        assert task["title"] == "Test Task"
-        assert task["description"] == "Test Description"
-        assert task["priority"] == "high"
-        assert task["completed"] is False
-        assert isinstance(task["created_at"], datetime)
+        assert task.id == 1
+        assert task.title == "Test Task"
+        assert task.description == "Test Description"
+        assert task.priority == "high"
+        assert task.completed is False
+        assert isinstance(task.created_at, datetime)
 
-    def test_get_task(self) -> None:
+    def test_get_task(self, db: Database) -> None:
         """Test getting a specific task"""
         task_data = MockTaskCreate(title="Get Task Test")
-        created = self.db.create_task(task_data)
+        created = db.create_task(task_data)
 
-        task = self.db.get_task(created["id"])
+        task = db.get_task(created.id)
 
         assert task is not None
-        assert task["title"] == "Get Task Test"
+        assert task.title == "Get Task Test"
+
+    @pytest.mark.parametrize("method,args,expected", [
+        ("get_task", (), None),
+        ("update_task", (MockTaskUpdate(title="Updated"),), None),
+        ("delete_task", (), False),
+    ])
+    def test_nonexistent_task(self, db: Database, method: str, args: tuple, expected: Optional[bool]) -> None:
+        """Test reading, updating and deleting a task that doesn't exist"""
+        result = getattr(db, method)(9999, *args)
 
-    def test_get_nonexistent_task(self) -> None:
-        """Test getting a task that doesn't exist"""
-        task = self.db.get_task(9999)
-        assert task is None
+        assert result is expected
 
-    def test_get_all_tasks(self) -> None:
+    def test_get_all_tasks(self, db: Database) -> None:
         """Test getting all tasks"""
-        self.db.create_task(MockTaskCreate(title="Task 1"))
-        self.db.create_task(MockTaskCreate(title="Task 2"))
-        self.db.create_task(MockTaskCreate(title="Task 3"))
+        db.create_task(MockTaskCreate(title="Task 1"))
+        db.create_task(MockTaskCreate(title="Task 2"))
+        db.create_task(MockTaskCreate(title="Task 3"))
 
-        tasks = self.db.get_tasks()
+        tasks = db.get_tasks()
 
         assert len(tasks) == 3
 
-    def test_get_tasks_with_pagination(self) -> None:
+    def test_get_tasks_with_pagination(self, db: Database) -> None:
         """Test pagination"""
         for i in range(10):
-            self.db.create_task(MockTaskCreate(title=f"Task {i}"))
+            db.create_task(MockTaskCreate.model_construct(title=f"Task {i}", description=None, priority="medium"))
 
-        tasks = self.db.get_tasks(skip=2, limit=3)
+        tasks = db.get_tasks(skip=2, limit=3)
 
         assert len(tasks) == 3
-        assert tasks[0]["title"] == "Task 2"
+        assert tasks[0].title == "Task 2"
 
-    def test_get_tasks_filter_by_priority(self) -> None:
+    def test_get_tasks_filter_by_priority(self, db: Database) -> None:
         """Test filtering by priority"""
-        self.db.create_task(MockTaskCreate(title="Low", priority="low"))
-        self.db.create_task(MockTaskCreate(title="High", priority="high"))
-        self.db.create_task(MockTaskCreate(title="High 2", priority="high"))
+        db.create_task(MockTaskCreate(title="Low", priority="low"))
+        db.create_task(MockTaskCreate(title="High", priority="high"))
+        db.create_task(MockTaskCreate(title="High 2", priority="high"))
 
-        tasks = self.db.get_tasks(priority="high")
+        tasks = db.get_tasks(priority="high")
 
         assert len(tasks) == 2
-        assert all(t["priority"] == "high" for t in tasks)
+        assert all(t.priority == "high" for t in tasks)
+
+    def test_priority_strings_are_shared(self, db: Database) -> None:
+        """Test tasks reuse one string object per priority"""
+        first = db.create_task(MockTaskCreate(title="First", priority="".join(["hi", "gh"])))
+        second = db.create_task(MockTaskCreate(title="Second", priority="high"))
+
+        assert first.priority is second.priority
+
+    def test_get_tasks_filter_by_priority_and_completed(self, db: Database) -> None:
+        """Test combined filters keep creation order and paginate"""
+        for i in range(6):
+            db.create_task(MockTaskCreate(title=f"Task {i}", priority="high" if i % 2 else "low"))
+        for task_id in (2, 4, 5):
+            db.update_task(task_id, _MARK_COMPLETED)
+        db.update_task(6, MockTaskUpdate(priority="low"))
+
+        tasks = db.get_tasks(completed=True, priority="high")
+        page = db.get_tasks(skip=1, limit=1, completed=False)
+
+        assert [t.title for t in tasks] == ["Task 1", "Task 3"]
+        assert [t.title for t in page] == ["Task 2"]
 
-    def test_update_task(self) -> None:
+    @pytest.mark.parametrize("skip,limit", [(-2, 3), (-3, 2), (1, -1), (-1, -1)])
+    def test_filtered_pagination_matches_slicing(self, db: Database, skip: int, limit: int) -> None:
+        """Test filtered reads page like slicing the unfiltered list, negative bounds included"""
+        for i in range(5):
+            db.create_task(MockTaskCreate.model_construct(title=f"Task {i}", description=None, priority="medium"))
+
+        filtered = db.get_tasks(skip=skip, limit=limit, completed=False)
+        unfiltered = db.get_tasks(skip=skip, limit=limit)
+
+        assert [t.id for t in filtered] == [t.id for t in unfiltered]
+
+    def test_update_task(self, db: Database) -> None:
         """Test task update"""
         task_data = MockTaskCreate(title="Original Title")
-        created = self.db.create_task(task_data)
+        created = db.create_task(task_data)
 
         update = MockTaskUpdate(title="Updated Title", completed=True)
-        updated = self.db.update_task(created["id"], update)
+        updated = db.update_task(created.id, update)
 
-        assert updated["title"] == "Updated Title"
-        assert updated["completed"] is True
+        assert updated.title == "Updated Title"
+        assert updated.completed is True
 
-    def test_update_nonexistent_task(self) -> None:
-        """Test updating a task that doesn't exist"""
-        update = MockTaskUpdate(title="Updated")
-        result = self.db.update_task(9999, update)
-
-        assert result is None
-
-    def test_delete_task(self) -> None:
+    def test_delete_task(self, db: Database) -> None:
         """Test task deletion"""
         task_data = MockTaskCreate(title="To Delete")
-        created = self.db.create_task(task_data)
+        created = db.create_task(task_data)
 
-        result = self.db.delete_task(created["id"])
+        result = db.delete_task(created.id)
 
         assert result is True
-        assert self.db.get_task(created["id"]) is None
+        assert db.get_task(created.id) is None
+
+    def test_delete_keeps_task_order(self, db: Database) -> None:
+        """Test remaining tasks keep creation order after a delete"""
+        for i in range(4):
+            db.create_task(MockTaskCreate.model_construct(title=f"Task {i}", description=None, priority="medium"))
 
-    def test_delete_nonexistent_task(self) -> None:
-        """Test deleting a task that doesn't exist"""
-        result = self.db.delete_task(9999)
-        assert result is False
+        db.delete_task(2)
 
-    def test_get_stats(self) -> None:
+        assert [t.title for t in db.get_tasks()] == ["Task 0", "Task 2", "Task 3"]
+        assert db.get_task(3).title == "Task 2"
+
+    def test_concurrent_reads_and_writes(self, db: Database) -> None:
+        """Test mixed readers and writers leave the database consistent"""
+        def worker(i: int) -> None:
+            created = db.create_task(MockTaskCreate.model_construct(title=f"Task {i}", description=None, priority="high"))
+            db.get_tasks(priority="high")
+            db.update_task(created.id, _MARK_COMPLETED)
+            db.get_stats()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(worker, range(200)))
+
+        stats = db.get_stats()
+        assert stats["total_tasks"] == 200
+        assert stats["completed_tasks"] == 200
+        assert len({t.id for t in db.get_tasks(limit=500)}) == 200
+
+    def test_get_stats(self, db: Database) -> None:
         """Test statistics generation"""
-        self.db.create_task(MockTaskCreate(title="Task 1", priority="high"))
-        self.db.create_task(MockTaskCreate(title="Task 2", priority="low"))
-        task3 = self.db.create_task(MockTaskCreate(title="Task 3", priority="high"))
+        db.create_task(MockTaskCreate(title="Task 1", priority="high"))
+        db.create_task(MockTaskCreate(title="Task 2", priority="low"))
+        task3 = db.create_task(MockTaskCreate(title="Task 3", priority="high"))
 
         # Mark one as completed
-        self.db.update_task(task3["id"], MockTaskUpdate(completed=True))
+        db.update_task(task3.id, _MARK_COMPLETED)
 
-        stats = self.db.get_stats()
+        stats = db.get_stats()
 
         assert stats["total_tasks"] == 3
         assert stats["completed_tasks"] == 1
@@ -159,6 +217,22 @@ class TestDatabase:
         assert stats["by_priority"]["high"] == 2
         assert stats["by_priority"]["low"] == 1
 
+    def test_get_stats_tracks_updates_and_deletes(self, db: Database) -> None:
+        """Test statistics follow priority/completion changes and deletes"""
+        task1 = db.create_task(MockTaskCreate(title="Task 1", priority="high"))
+        task2 = db.create_task(MockTaskCreate(title="Task 2", priority="low"))
+
+        db.update_task(task1.id, MockTaskUpdate(priority="critical", completed=True))
+        db.update_task(task1.id, _MARK_COMPLETED)
+        db.update_task(task2.id, _MARK_COMPLETED)
+        db.delete_task(task2.id)
+
+        stats = db.get_stats()
+
+        assert stats["total_tasks"] == 1
+        assert stats["completed_tasks"] == 1
+        assert stats["by_priority"] == {"low": 0, "medium": 0, "high": 0, "critical": 1}
+
 
 class TestTaskValidation:
     """Unit tests for task data validation"""
@@ -183,5 +257,65 @@ class TestTaskValidation:
         assert task.description is None
 
 
+class TestTaskCache:
+    """Unit tests for the task list cache"""
+
+    def test_disabled_cache_always_misses(self) -> None:
+        """Test cache without Redis is a no-op"""
+        cache = TaskCache.from_url(None)
+
+        key = cache.page_key(0, 100, None, None)
+        cache.set(key, b"[]")
+
+        assert cache.enabled is False
+        assert cache.get(key) is None
+
+    def test_page_round_trip(self, task_cache: TaskCache) -> None:
+        """Test a stored page is returned for the same query"""
+        cache = task_cache
+
+        cache.set(cache.page_key(0, 100, None, "high"), b"[1]")
+
+        assert cache.get(cache.page_key(0, 100, None, "high")) == b"[1]"
+        assert cache.get(cache.page_key(0, 100, None, "low")) is None
+
+    def test_invalidate_drops_cached_pages(self, task_cache: TaskCache) -> None:
+        """Test writes make earlier pages unreachable"""
+        cache = task_cache
+        cache.set(cache.page_key(0, 100, None, None), b"[1]")
+
+        cache.invalidate()
+
+        assert cache.get(cache.page_key(0, 100, None, None)) is None
+
+    def test_none_and_string_none_get_different_keys(self, task_cache: TaskCache) -> None:
+        """Test an unfiltered page can't be served for ?priority=None"""
+        assert task_cache.page_key(0, 100, None, None) != task_cache.page_key(0, 100, None, "None")
+
+    def test_redis_errors_pause_the_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a failing Redis is called once per cooldown, not on every lookup"""
+        calls = []
+
+        class DownRedis:
+            def get(self, key: str):
+                calls.append(key)
+                raise cache_module.redis.ConnectionError("down")
+
+        cache = TaskCache(DownRedis(), cooldown=60)
+        key = cache.page_key(0, 100, None, None)
+
+        assert cache.get(key) is None
+        cache.set(key, b"[]")
+        assert cache.page_key(0, 100, None, None) is None
+        assert len(calls) == 1
+
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: float("inf"))
+        assert cache.page_key(0, 100, None, None) is not None
+
+    def test_caches_do_not_share_keys(self) -> None:
+        """Test two processes sharing one Redis never read each other's pages"""
+        assert TaskCache(object()).page_key(0, 100) != TaskCache(object()).page_key(0, 100)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])